@@ -153,7 +153,7 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 @var builtInTransformers: List of built-in transformers that are to be run regardless, because they are part of the RDFa spec
 @var CACHE_DIR_VAR: Environment variable used to define cache directories for RDFa vocabularies in case the default setting does not work or is not appropriate.
 @var rdfa_current_version: Current "official" version of RDFa that this package implements by default. This can be changed at the invocation of the package
-@var uri_schemes: List of registered (or widely used) URI schemes; used for warnings...
+@var uri_schemes: Set of registered (or widely used) URI schemes; used for warnings...
 """
 
 __version__ = "4.0.0"
@@ -292,13 +292,6 @@ err_unusual_char_in_URI             = "Unusual character in uri: %s; possible er
 
 #############################################################################################
 
-from .state            import ExecutionContext
-from .parse            import parse_one_node
-from .options          import Options
-from .transform        import top_about, empty_safe_curie, vocab_for_role
-from .utils            import URIOpener
-from .host             import HostLanguage, MediaTypes, preferred_suffixes, content_to_host_language
-
 # Environment variable used to characterize cache directories for RDFa vocabulary files.
 CACHE_DIR_VAR           = "PyRdfaCacheDir"
 
@@ -344,7 +337,15 @@ other_used_schemes = [
 	"hdl", "isbn", "issn", "mstp", "rtmp", "rtspu", "stp"
 ]
 
-uri_schemes = registered_iana_schemes + unofficial_common + historical_iana_schemes + provisional_iana_schemes + other_used_schemes
+# Stored as a frozenset: the variable is used for (frequent) membership tests only
+uri_schemes = frozenset(registered_iana_schemes + unofficial_common + historical_iana_schemes + provisional_iana_schemes + other_used_schemes)
+
+from .state            import ExecutionContext
+from .parse            import parse_one_node
+from .options          import Options
+from .transform        import top_about, empty_safe_curie, vocab_for_role
+from .utils            import URIOpener
+from .host             import HostLanguage, MediaTypes, preferred_suffixes, content_to_host_language
 
 # List of built-in transformers that are to be run regardless, because they are part of the RDFa spec
 builtInTransformers = [
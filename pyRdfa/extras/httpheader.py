@@ -124,12 +124,12 @@ except NameError:
 
 try:
     # Turn character classes into set types (for Python 2.4 or greater)
-    SEPARATORS = frozenset([c for c in SEPARATORS])
-    LWS = frozenset([c for c in LWS])
-    CRLF = frozenset([c for c in CRLF])
-    DIGIT = frozenset([c for c in DIGIT])
-    HEX = frozenset([c for c in HEX])
-    del c
+    # frozenset iterates the string directly; no need for an intermediate list
+    SEPARATORS = frozenset(SEPARATORS)
+    LWS = frozenset(LWS)
+    CRLF = frozenset(CRLF)
+    DIGIT = frozenset(DIGIT)
+    HEX = frozenset(HEX)
 except NameError:
     # Python 2.3 or earlier, leave as simple strings
     pass
@@ -43,6 +43,10 @@ else :
 from .      import IncorrectBlankNodeUsage, err_no_blank_node
 from .utils import has_one_of_attributes
 
+# The HTML related host languages, consulted by the per-element checks below; the module level
+# frozenset avoids rebuilding a list literal (and scanning it) for every single element
+_html_style_languages = frozenset([ HostLanguage.xhtml, HostLanguage.html5, HostLanguage.xhtml5 ])
+
 #######################################################################
 def parse_one_node(node, graph, parent_object, incoming_state, parent_incomplete_triples) :
 	"""The (recursive) step of handling a single node. 
@@ -88,7 +92,7 @@ def _parse_1_1(node, graph, parent_object, incoming_state, parent_incomplete_tri
 	"""
 	def header_check(p_obj) :
 		"""Special disposition for the HTML <head> and <body> elements..."""
-		if state.options.host_language in [ HostLanguage.xhtml, HostLanguage.html5, HostLanguage.xhtml5 ] :
+		if state.options.host_language in _html_style_languages :
 			if node.nodeName == "head" or node.nodeName == "body" :
 				if not has_one_of_attributes(node, "about", "resource", "src", "href") :
 					return p_obj
@@ -96,8 +100,8 @@ def _parse_1_1(node, graph, parent_object, incoming_state, parent_incomplete_tri
 			return None
 
 	def lite_check() :
-		if state.options.check_lite and state.options.host_language in [ HostLanguage.html5, HostLanguage.xhtml5, HostLanguage.xhtml ] :
-			if node.tagName == "link" and node.hasAttribute("rel") and state.term_or_curie.CURIE_to_URI(node.getAttribute("rel")) != None :
+		if state.options.check_lite and state.options.host_language in _html_style_languages :
+			if node.tagName == "link" and node.hasAttribute("rel") and state.term_or_curie.CURIE_to_URI(node.getAttribute("rel"), state) != None :
 				state.options.add_warning("In RDFa Lite, attribute @rel in <link> is only used in non-RDFa way (consider using @property)", node=node)
 
 	# Update the state. This means, for example, the possible local settings of
@@ -200,7 +200,7 @@ class ProcessProperty :
 			else :
 				# no controlling @datatype. We have to see if there is markup in the contained
 				# element
-				if True in [ n.nodeType == self.node.ELEMENT_NODE for n in self.node.childNodes ] :
+				if any(n.nodeType == self.node.ELEMENT_NODE for n in self.node.childNodes) :
 					# yep, and XML Literal should be generated
 					object = self._create_Literal(self._get_XML_literal(self.node), datatype=XMLLiteral)
 				else :
@@ -14,6 +14,7 @@ $Id: process.py,v 1.7 2012-03-23 14:06:38 ivan Exp $ $Date: 2012-03-23 14:06:38
 
 import sys
 import os
+import datetime
 
 import rdflib
 from rdflib	import URIRef
@@ -45,11 +46,24 @@ from . import err_unrecognised_vocab_type
 
 from .. import VocabReferenceError
 
-from .cache import CachedVocab
+from .cache import CachedVocab, xml_application_media_type
 from .. import HTTPError, RDFaError
 
 #############################################################################################################
 
+# Dispatch table for the directly parseable vocabulary media types: maps the content type to the
+# RDFLib parser format (None meaning RDFLib's default, ie, RDF/XML) and the warning to use when
+# the parsing fails (see L{return_graph})
+_parser_by_media_type = {
+	MediaTypes.turtle	: ("n3", err_unparsable_Turtle_vocab),
+	MediaTypes.rdfxml	: (None, err_unparsable_Turtle_vocab),
+	MediaTypes.nt		: ("nt", err_unparsable_ntriples_vocab),
+}
+
+# The media types handled by a full RDFa parsing (beyond those, the generic XML application
+# media types are recognized via the xml_application_media_type pattern)
+_xml_family = frozenset([MediaTypes.xhtml, MediaTypes.html, MediaTypes.xml])
+
 def return_graph(uri, options, newCache = False) :
 	"""Parse a file, and return an RDFLib Graph. The URI's content type is checked and either one of
 	RDFLib's parsers is invoked (for the Turtle, RDF/XML, and N Triple cases) or a separate RDFa processing is invoked
@@ -93,28 +107,19 @@ def return_graph(uri, options, newCache = False) :
 	# Store the expiration date of the newly accessed data
 	expiration_date = content.expiration_date
 					
-	if content.content_type == MediaTypes.turtle :
+	entry = _parser_by_media_type.get(content.content_type)
+	if entry != None :
+		(format, parse_error) = entry
 		try :
 			retval = Graph()
-			retval.parse(content.data, format="n3")
-		except :
-			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_Turtle_vocab % (uri,value))
-	elif content.content_type == MediaTypes.rdfxml :
-		try :
-			retval = Graph()
-			retval.parse(content.data)
-		except :
-			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_Turtle_vocab % (uri,value))
-	elif content.content_type == MediaTypes.nt :
-		try :
-			retval = Graph()
-			retval.parse(content.data, format="nt")
+			if format == None :
+				retval.parse(content.data)
+			else :
+				retval.parse(content.data, format=format)
 		except :
 			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_ntriples_vocab % (uri,value))
-	elif content.content_type in [MediaTypes.xhtml, MediaTypes.html, MediaTypes.xml] or xml_application_media_type.match(content.content_type) != None :
+			options.add_warning(parse_error % (uri,value))
+	elif content.content_type in _xml_family or xml_application_media_type.match(content.content_type) != None :
 		try :
 			from pyRdfa import pyRdfa
 			from pyRdfa.options	import Options
@@ -151,6 +156,9 @@ class MiniOWL :
 		self.graph         		= graph
 		self.added_triples 		= None
 		self.schema_semantics 	= schema_semantics
+		self._by_pred			= None
+		self._by_subject		= None
+		self._by_object			= None
 
 	def closure(self) :
 		"""
@@ -173,6 +181,20 @@ class MiniOWL :
 			# the current graph yet
 			self.added_triples = set()
 
+			# The graph is not modified within a cycle (new triples are collected separately and
+			# added at the end), so the lookups the rules make can be served from indexes built in
+			# a single sweep; this replaces the per-triple store probes that made the chaining
+			# quadratic in the number of schema triples
+			self._by_pred    = {}
+			self._by_subject = {}
+			self._by_object  = {}
+			for (s, p, o) in self.graph :
+				self._by_pred.setdefault(p, []).append((s, o))
+				if p == subPropertyOf or p == equivalentProperty or p == subClassOf or p == equivalentClass :
+					self._by_subject.setdefault((s, p), []).append(o)
+				if p == type or p == equivalentProperty or p == equivalentClass :
+					self._by_object.setdefault((p, o), []).append(s)
+
 			# Execute all the rules; these might fill up the added triples array
 			for t in self.graph : self.rules(t)
 
@@ -203,53 +225,136 @@ class MiniOWL :
 	def rules(self, t) :
 		"""
 			Go through the OWL-RL entailement rules prp-spo1, prp-eqp1, prp-eqp2, cax-sco, cax-eqc1, and cax-eqc2 by extending the graph.
+
+			The matching triples are taken from the indexes built by L{closure} for the cycle, instead of
+			querying the graph again for each candidate triple.
 			@param t: a triple (in the form of a tuple)
 		"""
 		s,p,o = t
 		if self.schema_semantics :
 			# extra resonings on the vocabulary only to reduce the overall load by reducing the expected number of chaining cycles
 			if p == subPropertyOf :
-				for Z,Y,xxx in self.graph.triples((o, subPropertyOf, None)) :
-					self.store_triple((s,subPropertyOf,xxx))  
+				for xxx in self._by_subject.get((o, subPropertyOf), ()) :
+					self.store_triple((s,subPropertyOf,xxx))
 			elif p == equivalentProperty :
-				for Z,Y,xxx in self.graph.triples((o, equivalentProperty, None)) :
-					self.store_triple((s,equivalentProperty,xxx))  
-				for xxx,Y,Z in self.graph.triples((None, equivalentProperty, s)) :
-					self.store_triple((xxx,equivalentProperty,o))  
+				for xxx in self._by_subject.get((o, equivalentProperty), ()) :
+					self.store_triple((s,equivalentProperty,xxx))
+				for xxx in self._by_object.get((equivalentProperty, s), ()) :
+					self.store_triple((xxx,equivalentProperty,o))
 			elif p == subClassOf :
-				for Z,Y,xxx in self.graph.triples((o, subClassOf, None)) :
+				for xxx in self._by_subject.get((o, subClassOf), ()) :
 					self.store_triple((s,subClassOf,xxx))
 			elif p == equivalentClass :
-				for Z,Y,xxx in self.graph.triples((o, equivalentClass, None)) :
-					self.store_triple((s,equivalentClass,xxx))  
-				for xxx,Y,Z in self.graph.triples((None, equivalentClass, s)) :
-					self.store_triple((xxx,equivalentClass,o))  
+				for xxx in self._by_subject.get((o, equivalentClass), ()) :
+					self.store_triple((s,equivalentClass,xxx))
+				for xxx in self._by_object.get((equivalentClass, s), ()) :
+					self.store_triple((xxx,equivalentClass,o))
 		else :
 			if p == subPropertyOf :
 				# prp-spo1
-				for zzz,Z,www in self.graph.triples((None, s, None)) :
+				for zzz,www in self._by_pred.get(s, ()) :
 					self.store_triple((zzz, o, www))
 			elif p == equivalentProperty :
 				# prp-eqp1
-				for zzz,Z,www in self.graph.triples((None, s, None)) :
+				for zzz,www in self._by_pred.get(s, ()) :
 					self.store_triple((zzz, o, www))
 				# prp-eqp2
-				for zzz,Z,www in self.graph.triples((None, o, None)) :
-					self.store_triple((zzz, s, www))					
+				for zzz,www in self._by_pred.get(o, ()) :
+					self.store_triple((zzz, s, www))
 			elif p == subClassOf :
 				# cax-sco
-				for vvv,Y,Z in self.graph.triples((None, type, s)) :
+				for vvv in self._by_object.get((type, s), ()) :
 					self.store_triple((vvv, type, o))
 			elif p == equivalentClass :
 				# cax-eqc1
-				for vvv,Y,Z in self.graph.triples((None, type, s)) :
+				for vvv in self._by_object.get((type, s), ()) :
 					self.store_triple((vvv, type, o))
 				# cax-eqc2
-				for vvv,Y,Z in self.graph.triples((None, type, o)) :
+				for vvv in self._by_object.get((type, o), ()) :
 					self.store_triple((vvv, type, s))
 
 ########################################################################################################
 
+# Run-time cache for the parsed vocabulary graphs, keyed by vocabulary URI. The disk cache (see
+# L{CachedVocab<pyRdfa.rdfs.cache.CachedVocab>}) avoids re-fetching across runs; this in-memory layer
+# avoids re-loading and re-parsing the same vocabulary when several documents are processed by the
+# same process. The expiration date is stored alongside the graph so that long-running processes do
+# not serve stale data.
+_vocab_graph_cache = {}
+
+def _get_vocab_graph(uri, options) :
+	"""Return the vocabulary graph for the URI, consulting the run-time cache first and falling
+	back on the disk cache or a direct fetch (depending on the caching options).
+	@param uri: URI for the vocabulary graph
+	@param options: options as defined for the RDFa run; used to generate warnings
+	@type options: L{pyRdfa.Options}
+	@return: A tuple of an RDFLib Graph instance (or None if the vocabulary could not be
+	retrieved) and the corresponding expiration date (or None)
+	"""
+	entry = _vocab_graph_cache.get(uri)
+	if entry != None :
+		(v_graph, expiration_date) = entry
+		if expiration_date == None or datetime.datetime.utcnow() <= expiration_date :
+			return (v_graph, expiration_date)
+
+	if options.vocab_cache :
+		cached_vocab    = CachedVocab(uri, options)
+		v_graph         = cached_vocab.graph
+		expiration_date = cached_vocab.expiration_date
+	else :
+		(v_graph, expiration_date) = return_graph(uri, options)
+
+	if v_graph != None :
+		_vocab_graph_cache[uri] = (v_graph, expiration_date)
+	return (v_graph, expiration_date)
+
+# The merged and schema-expanded vocabulary graphs, keyed by the (sorted) tuple of vocabulary
+# URIs a document refers to. Caching only the individual graphs would still leave the merge and
+# the schema level closure — the expensive, derived part — to be redone for every document; the
+# entry expires when the earliest of its component vocabularies does.
+_expanded_vocab_cache = {}
+
+def _get_expanded_vocab_graph(vocabs, options) :
+	"""Return the merged vocabulary graph for the URIs, expanded via the schema level
+	L{MiniOWL} closure. The result is cached across documents; on a miss the individual
+	vocabulary graphs are obtained through L{_get_vocab_graph}.
+	@param vocabs: set of vocabulary URIs
+	@param options: options as defined for the RDFa run; used to generate warnings
+	@type options: L{pyRdfa.Options}
+	@return: An RDFLib Graph instance
+	"""
+	key   = tuple(sorted(vocabs))
+	entry = _expanded_vocab_cache.get(key)
+	if entry != None :
+		(vocab_graph, expiration_date) = entry
+		if expiration_date == None or datetime.datetime.utcnow() <= expiration_date :
+			return vocab_graph
+
+	vocab_graph     = Graph()
+	expiration_date = None
+	all_loaded      = True
+	for uri in vocabs :
+		(v_graph, v_expiration) = _get_vocab_graph(uri, options)
+		if v_graph != None :
+			for t in v_graph :
+				vocab_graph.add(t)
+			if v_expiration != None and (expiration_date == None or v_expiration < expiration_date) :
+				expiration_date = v_expiration
+		else :
+			all_loaded = False
+
+	# Get the closure of the vocab graph; this will take care of local subproperty, etc, statements
+	# Strictly speaking this is not necessary, but will speed up processing, because it may save
+	# chaining cycles on the real graph
+	MiniOWL(vocab_graph, schema_semantics = True).closure()
+
+	# An incomplete expansion is not cached: the per-URI layer does not cache failures either, and
+	# a transient fetch error should be retried (and warned about) for the next document instead
+	# of serving an incomplete, never expiring entry for the lifetime of the process
+	if all_loaded :
+		_expanded_vocab_cache[key] = (vocab_graph, expiration_date)
+	return vocab_graph
+
 def process_rdfa_sem(graph, options) :
 	"""
 	Expand the graph through the minimal RDFS and OWL rules defined for RDFa.
@@ -273,22 +378,10 @@ def process_rdfa_sem(graph, options) :
 		vocabs.add((str(v)))
 
 	if len(vocabs) >= 0 :
-		# 2. get all the vocab graphs
-		vocab_graph = Graph()
-		for uri in vocabs :
-			if options.vocab_cache :
-				v_graph = CachedVocab(uri, options).graph
-			else :
-				(v_graph, exp_date) = return_graph(uri, options)
-			if v_graph != None :
-				for t in v_graph :
-					vocab_graph.add(t)
-				
-		# 3. Get the closure of the vocab graph; this will take care of local subproperty, etc, statements
-		# Strictly speaking this is not necessary, but will speed up processing, because it may save chaining cycles on the
-		# real graph
-		MiniOWL(vocab_graph, schema_semantics = True).closure()
-		
+		# 2 & 3. get the merged vocab graphs, expanded on the schema level; this is cached
+		# across documents referring to the same set of vocabularies
+		vocab_graph = _get_expanded_vocab_graph(vocabs, options)
+
 		# 4. Now get the vocab graph content added to the default graph
 		for t in vocab_graph :
 			graph.add(t)
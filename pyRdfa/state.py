@@ -20,6 +20,7 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 $Id: state.py,v 1.23 2013-10-16 11:48:54 ivan Exp $
 $Date: 2013-10-16 11:48:54 $
 """
+import re
 import sys
 (py_v_major, py_v_minor, py_v_micro, py_v_final, py_v_serial) = sys.version_info
 
@@ -39,8 +40,9 @@ from .options	import Options
 from .utils 	import quote_URI
 from .host 		import HostLanguage, accept_xml_base, accept_xml_lang, beautifying_prefixes
 
-from .termorcurie	import TermOrCurie
+from .termorcurie	import TermOrCurie, ncname, termname
 from .				import UnresolvablePrefix, UnresolvableTerm
+from .				import uri_schemes, rdfa_current_version
 
 from . import err_lang							
 from . import err_URI_scheme						
@@ -55,6 +57,73 @@ if py_v_major >= 3 :
 else :	
 	from urlparse import urlparse, urlunparse, urlsplit, urljoin
 
+# Regular expression object to extract the scheme part of a URI. urlsplit performs a full
+# RFC 3986 split (allocating a named tuple on each call), which is a waste when only the scheme
+# is of interest; the regular expression is considerably cheaper on this hot path
+_scheme_pattern = re.compile("^([A-Za-z][A-Za-z0-9+.-]*):")
+
+# Cache for resolved URI references, keyed by (base, attribute value) pairs. URIRef instances are
+# immutable, so sharing them among call sites is safe; the size cap keeps pathological documents
+# from growing the cache without bounds
+_uri_cache          = {}
+_uri_cache_max_size = 4096
+
+# Interning table for URIRef instances. The same URI (the document base, rdf:type, a repeated
+# @href, etc) shows up many times in a typical document; handing out one shared, immutable URIRef
+# per string reduces both allocations and graph memory. A plain bounded dictionary is used because
+# str subclasses cannot always be weakly referenced
+_uriref_intern = {}
+
+def _intern_uriref(uri) :
+	"""Return a shared URIRef instance for the URI string, creating and storing it if necessary.
+	@param uri: URI string
+	@return: an RDFLib URIRef instance
+	"""
+	retval = _uriref_intern.get(uri)
+	if retval == None :
+		retval = URIRef(uri)
+		if len(_uriref_intern) >= _uri_cache_max_size :
+			del _uriref_intern[next(iter(_uriref_intern))]
+		_uriref_intern[uri] = retval
+	return retval
+
+# Host languages where the HTML-style @lang/@xml:lang interplay applies; stored as a frozenset
+# to avoid re-creating a list for the membership test on each node
+_html_style_languages = frozenset([ HostLanguage.xhtml, HostLanguage.xhtml5, HostLanguage.html5 ])
+
+def _find_base_elements(root) :
+	"""Generator yielding the C{base} elements below the root, in document order. Equivalent to
+	C{root.getElementsByTagName("base")}, but walks the tree iteratively via the
+	C{firstChild}/C{nextSibling} references instead of materializing the full descendant list.
+	@param root: DOM element node
+	"""
+	node = root.firstChild
+	while node != None :
+		next = None
+		if node.nodeType == node.ELEMENT_NODE :
+			if node.tagName == "base" :
+				yield node
+			next = node.firstChild
+		if next == None :
+			next = node.nextSibling
+			while next == None :
+				node = node.parentNode
+				if node == None or node is root :
+					return
+				next = node.nextSibling
+		node = next
+
+def _get_scheme(uri) :
+	"""Extract the scheme part of a URI (lower case, as produced by urlsplit); "" if there is none.
+	@param uri: URI string
+	@return: scheme string (possibly empty)
+	"""
+	m = _scheme_pattern.match(uri)
+	if m == None :
+		return ""
+	else :
+		return m.group(1).lower()
+
 class ListStructure :
 	"""Special class to handle the C{@inlist} type structures in RDFa 1.1; stores the "origin", i.e,
 	where the list will be attached to, and the mappings as defined in the spec.
@@ -85,14 +154,39 @@ class ExecutionContext :
 	@ivar supress_lang: in some cases, the effect of the lang attribute should be supressed for the given node, although it should be inherited down below (example: @value attribute of the data element in HTML5)
 	@type supress_lang: Boolean
 	@cvar _list: list of attributes that allow for lists of values and should be treated as such
-	@cvar _resource_type: dictionary; mapping table from attribute name to the exact method to retrieve the URI(s). Is initialized at first instantiation.
+	@cvar _resource_kind: dictionary; mapping table from attribute name to a small integer tag identifying the method to retrieve the URI(s).
 	"""
 
-	# list of attributes that allow for lists of values and should be treated as such	
-	_list = [ "rel", "rev", "property", "typeof", "role" ]
-	# mapping table from attribute name to the exact method to retrieve the URI(s).
-	_resource_type = {}
-	
+	# an instance is created for every element of the DOM tree; __slots__ removes the per-instance
+	# dictionary, which both shrinks the memory footprint and speeds up the attribute accesses
+	__slots__ = (
+		"node", "base", "parsedBase", "_base_is_local", "options", "term_or_curie", "lang",
+		"defaultNS", "rdfa_version", "list_mapping", "new_list", "supress_lang",
+	)
+
+	# set of attributes that allow for lists of values and should be treated as such
+	_list = frozenset([ "rel", "rev", "property", "typeof", "role" ])
+	# integer tags identifying the method retrieving the URI(s) for an attribute; dispatching on a
+	# small integer avoids the per-call indirection through a dictionary of methods
+	_URI_KIND	 = 0
+	_CURIE_KIND	 = 1
+	_TERM_KIND	 = 2
+	_resource_kind = {
+		"href"		:	_URI_KIND,
+		"src"		:	_URI_KIND,
+		"vocab"		:	_URI_KIND,
+
+		"about"		:	_CURIE_KIND,
+		"resource"	:	_CURIE_KIND,
+
+		"rel"		:	_TERM_KIND,
+		"rev"		:	_TERM_KIND,
+		"datatype"	:	_TERM_KIND,
+		"typeof"	:	_TERM_KIND,
+		"property"	:	_TERM_KIND,
+		"role"		:	_TERM_KIND,
+	}
+
 	def __init__(self, node, graph, inherited_state=None, base="", options=None, rdfa_version = None) :
 		"""
 		@param node: the current DOM Node
@@ -119,26 +213,16 @@ class ExecutionContext :
 			except :
 				return uri
 			
-		# This is, conceptually, an additional class initialization, but it must be done run time, otherwise import errors show up
-		if len(	ExecutionContext._resource_type ) == 0 :	
-			ExecutionContext._resource_type = {
-				"href"		:	ExecutionContext._URI,
-				"src"		:	ExecutionContext._URI,
-				"vocab"	    :   ExecutionContext._URI,
-			
-				"about"		:	ExecutionContext._CURIEorURI, 
-				"resource"	:	ExecutionContext._CURIEorURI, 
-			
-				"rel"		:	ExecutionContext._TERMorCURIEorAbsURI,
-				"rev"		:	ExecutionContext._TERMorCURIEorAbsURI,
-				"datatype"	:	ExecutionContext._TERMorCURIEorAbsURI,
-				"typeof"	:	ExecutionContext._TERMorCURIEorAbsURI,
-				"property"	:	ExecutionContext._TERMorCURIEorAbsURI,
-				"role"		:	ExecutionContext._TERMorCURIEorAbsURI,
-			}	
 		#-----------------------------------------------------------------
 		self.node = node
-		
+
+		# Take a snapshot of the attributes of the node; the initialization requires a repeated
+		# look-up of a number of attributes, and it is much cheaper to cross into the DOM layer only once
+		if node.hasAttributes() :
+			attrs = dict(node.attributes.items())
+		else :
+			attrs = {}
+
 		#-----------------------------------------------------------------
 		# Settling the base. In a generic XML, xml:base should be accepted at all levels (though this is not the
 		# case in, say, XHTML...)
@@ -153,8 +237,8 @@ class ExecutionContext :
 			self.new_list			= False
 			
 			# for generic XML versions the xml:base attribute should be handled
-			if self.options.host_language in accept_xml_base and node.hasAttribute("xml:base") :
-				self.base = remove_frag_id(node.getAttribute("xml:base"))
+			if self.options.host_language in accept_xml_base and "xml:base" in attrs :
+				self.base = remove_frag_id(attrs["xml:base"])
 		else :
 			# this is the branch called from the very top			
 			self.list_mapping = ListStructure()
@@ -163,12 +247,11 @@ class ExecutionContext :
 			if rdfa_version is not None :
 				self.rdfa_version = rdfa_version
 			else :
-				from . import rdfa_current_version				
 				self.rdfa_version = rdfa_current_version
 
 			# This value can be overwritten by a @version attribute
-			if node.hasAttribute("version") :
-				top_version = node.getAttribute("version")
+			if "version" in attrs :
+				top_version = attrs["version"]
 				if top_version.find("RDFa 1.0") != -1 or top_version.find("RDFa1.0") != -1 :
 					self.rdfa_version = "1.0"
 				elif top_version.find("RDFa 1.1") != -1 or top_version.find("RDFa1.1") != -1 :
@@ -176,20 +259,19 @@ class ExecutionContext :
 			
 			# this is just to play safe. I believe this should actually not happen...
 			if options == None :
-				from . import Options
 				self.options = Options()
 			else :
 				self.options = options
 
 			self.base = ""
 			# handle the base element case for HTML
-			if self.options.host_language in [ HostLanguage.xhtml, HostLanguage.html5, HostLanguage.xhtml5  ] :
-				for bases in node.getElementsByTagName("base") :
+			if self.options.host_language in _html_style_languages :
+				for bases in _find_base_elements(node) :
 					if bases.hasAttribute("href") :
 						self.base = remove_frag_id(bases.getAttribute("href"))
 						continue
-			elif self.options.host_language in accept_xml_base and node.hasAttribute("xml:base") :
-				self.base = remove_frag_id(node.getAttribute("xml:base"))
+			elif self.options.host_language in accept_xml_base and "xml:base" in attrs :
+				self.base = remove_frag_id(attrs["xml:base"])
 				
 			# If no local setting for base occurs, the input argument has it
 			if self.base == "" :
@@ -197,21 +279,43 @@ class ExecutionContext :
 				
 			# Perform an extra beautification in RDFLib
 			if self.options.host_language in beautifying_prefixes :
-				dict = beautifying_prefixes[self.options.host_language]
-				for key in dict :
-					graph.bind(key,dict[key])
+				nice_prefixes = beautifying_prefixes[self.options.host_language]
+				for key in nice_prefixes :
+					graph.bind(key,nice_prefixes[key])
 					
 			input_info = "Input Host Language:%s, RDFa version:%s, base:%s" % (self.options.host_language, self.rdfa_version, self.base)
 			self.options.add_info(input_info)
 
 								
 		#-----------------------------------------------------------------
-		# this will be used repeatedly, better store it once and for all...		
-		self.parsedBase = urlsplit(self.base)
+		# this will be used repeatedly, better store it once and for all...
+		# in the overwhelming majority of cases the base is simply inherited unchanged, so the
+		# parent's parsed value can be shared instead of re-splitting the same string per node
+		if inherited_state and self.base == inherited_state.base :
+			self.parsedBase = inherited_state.parsedBase
+		else :
+			self.parsedBase = urlsplit(self.base)
+		# a base without a scheme is, in fact, a local file name; checked by every URI resolution,
+		# so the comparison is done once here
+		self._base_is_local = (self.parsedBase[0] == "")
 
 		#-----------------------------------------------------------------
-		# generate and store the local CURIE handling class instance
-		self.term_or_curie = TermOrCurie(self, graph, inherited_state)
+		# generate and store the local CURIE handling class instance. If the node defines no
+		# prefix, vocabulary or xmlns mapping of its own, the parent's instance describes this
+		# node just as well and can simply be shared; that is the common case, and constructing
+		# a TermOrCurie per node is one of the biggest costs of the state handling
+		if inherited_state == None :
+			self.term_or_curie = TermOrCurie(self, graph, inherited_state, attrs)
+		else :
+			has_curie_attrs = False
+			for key in attrs :
+				if key == "prefix" or key == "vocab" or key.startswith("xmlns:") :
+					has_curie_attrs = True
+					break
+			if has_curie_attrs :
+				self.term_or_curie = TermOrCurie(self, graph, inherited_state, attrs)
+			else :
+				self.term_or_curie = inherited_state.term_or_curie
 
 		#-----------------------------------------------------------------
 		# Settling the language tags
@@ -226,40 +330,28 @@ class ExecutionContext :
 		self.supress_lang = False
 			
 			
-		if self.options.host_language in [ HostLanguage.xhtml, HostLanguage.xhtml5, HostLanguage.html5 ] :
+		if self.options.host_language in _html_style_languages :
 			# we may have lang and xml:lang
-			if node.hasAttribute("lang") :
-				lang = node.getAttribute("lang").lower()
-			else :
-				lang = None
-			if node.hasAttribute("xml:lang") :
-				xmllang = node.getAttribute("xml:lang").lower()
-			else :
-				xmllang = None
-			# First of all, set the value, if any
+			# @xml:lang has priority; in both cases an empty value resets the language to None
+			xmllang = attrs.get("xml:lang")
 			if xmllang != None :
-				# this has priority
-				if len(xmllang) != 0 :
-					self.lang = xmllang
-				else :
-					self.lang = None
-			elif lang != None :
-				if len(lang) != 0 :
-					self.lang = lang
-				else :
-					self.lang = None					
+				self.lang = xmllang.lower() or None
+			else :
+				lang = attrs.get("lang")
+				if lang != None :
+					self.lang = lang.lower() or None
 			# Ideally, a warning should be generated if lang and xmllang are both present with different values. But
 			# the HTML5 Parser does its magic by overriding a lang value if xmllang is present, so the potential
 			# error situations are simply swallowed...
 				
-		elif self.options.host_language in accept_xml_lang and node.hasAttribute("xml:lang") :
-				self.lang = node.getAttribute("xml:lang").lower()
+		elif self.options.host_language in accept_xml_lang and "xml:lang" in attrs :
+				self.lang = attrs["xml:lang"].lower()
 				if len(self.lang) == 0 : self.lang = None
-			
+
 		#-----------------------------------------------------------------
 		# Set the default namespace. Used when generating XML Literals
-		if node.hasAttribute("xmlns") :
-			self.defaultNS = node.getAttribute("xmlns")
+		if "xmlns" in attrs :
+			self.defaultNS = attrs["xmlns"]
 		elif inherited_state and inherited_state.defaultNS != None :
 			self.defaultNS = inherited_state.defaultNS
 		else :
@@ -277,15 +369,16 @@ class ExecutionContext :
 		def create_URIRef(uri, check = True) :
 			"""
 			Mini helping function: it checks whether a uri is using a usual scheme before a URIRef is created. In case
-			there is something unusual, a warning is generated (though the URIRef is created nevertheless)
+			there is something unusual, a warning is generated (though the URIRef is created nevertheless); the URI is
+			also recorded in the enclosing 'warned' cell, so that the warning can be replayed on later cache hits
 			@param uri: (absolute) URI string
 			@return: an RDFLib URIRef instance
 			"""
-			from .	import uri_schemes
 			val = uri.strip()
-			if check and urlsplit(val)[0] not in uri_schemes :
+			if check and _get_scheme(val) not in uri_schemes :
+				warned[0] = val
 				self.options.add_warning(err_URI_scheme % val.strip(), node=self.node.nodeName)
-			return URIRef(val)
+			return _intern_uriref(val)
 
 		def join(base, v, check = True) :
 			"""
@@ -302,40 +395,80 @@ class ExecutionContext :
 			if len(v) > 0 and v[0] == '?' and (py_v_major < 3 and py_v_minor <= 5) :
 				return create_URIRef(base+v, check)
 			####
-			
+
+			# the typical reference forms can be joined directly; urljoin re-splits and
+			# re-normalizes both operands, which is unnecessary for these cases
+			if v[0] == '#' :
+				# fragment reference; the base never carries a fragment at this point
+				if '#' not in base :
+					return create_URIRef(base + v, check)
+			elif v[0] == '/' and self.parsedBase[0] != "" and self.parsedBase[1] != "" :
+				if len(v) > 1 and v[1] == '/' :
+					# network-path reference: only the scheme of the base is kept
+					return create_URIRef(self.parsedBase[0] + ':' + v, check)
+				elif '/.' not in v :
+					# absolute-path reference: the scheme and the authority of the base are kept.
+					# Paths with dot segments are left to urljoin, which normalizes them away
+					return create_URIRef(self.parsedBase[0] + '://' + self.parsedBase[1] + v, check)
+
 			joined = urljoin(base, v)
-			try :
-				if v[-1] != joined[-1] and (v[-1] == "#" or v[-1] == "?") :
-					return create_URIRef(joined + v[-1], check)
-				else :
-					return create_URIRef(joined, check)
-			except :
+			if joined != "" and v != "" and v[-1] != joined[-1] and (v[-1] == "#" or v[-1] == "?") :
+				return create_URIRef(joined + v[-1], check)
+			else :
 				return create_URIRef(joined, check)
 
 		if val == "" :
 			# The fragment ID must be removed...
-			return URIRef(self.base)
-			
+			return _intern_uriref(self.base)
+
+		# if the value is already an absolute URI with a recognized scheme, the whole join machinery
+		# (which re-splits and re-assembles both operands) can be bypassed; this is the common case
+		# for full @href/@src values
+		scheme = _get_scheme(val)
+		if scheme != "" and scheme in uri_schemes :
+			return _intern_uriref(val.strip())
+
+		# many documents repeat the same relative reference over and over again (menus, 'sameAs'
+		# links, etc); as URIRef instances are immutable, the resolved values can be shared via
+		# a cache keyed by the (base, value) pair. If the original resolution raised an unusual
+		# scheme warning, that is replayed on a hit, too — attributed to the current node — so
+		# that the cache does not silently swallow the diagnostics of later occurrences
+		key = (self.base, val)
+		entry = _uri_cache.get(key)
+		if entry != None :
+			(retval, warned_uri) = entry
+			if warned_uri != None :
+				self.options.add_warning(err_URI_scheme % warned_uri, node=self.node.nodeName)
+			return retval
+
+		# the nested helpers note the URI an unusual scheme warning was issued for in this cell
+		warned = [ None ]
+
 		# fall back on good old traditional URI-s.
 		# To be on the safe side, let us use the Python libraries
-		if self.parsedBase[0] == "" :
+		if self._base_is_local :
 			# base is, in fact, a local file name
 			# The following call is just to be sure that some pathological cases when
 			# the ':' _does_ appear in the URI but not in a scheme position is taken
 			# care of properly...
-			
-			key = urlsplit(val)[0]
-			if key == "" :
+
+			if scheme == "" :
 				# relative URI, to be combined with local file name:
-				return join(self.base, val, check = False)
+				retval = join(self.base, val, check = False)
 			else :
-				return create_URIRef(val)
+				retval = create_URIRef(val)
 		else :
 			# Trust the python library...
 			# Well, not quite:-) there is what is, in my view, a bug in the urljoin; in some cases it
 			# swallows the '#' or '?' character at the end. This is clearly a problem with
-			# Semantic Web URI-s			
-			return join(self.base, val)
+			# Semantic Web URI-s
+			retval = join(self.base, val)
+
+		if len(_uri_cache) >= _uri_cache_max_size :
+			# primitive eviction: drop the oldest entry (dictionaries preserve the insertion order)
+			del _uri_cache[next(iter(_uri_cache))]
+		_uri_cache[key] = (retval, warned[0])
+		return retval
 	# end _URI
 
 	def _CURIEorURI(self, val) :
@@ -346,13 +479,13 @@ class ExecutionContext :
 		@return: an RDFLib URIRef instance or None
 		"""
 		if val == "" :
-			return URIRef(self.base)
+			return _intern_uriref(self.base)
 
 		safe_curie = False
-		if val[0] == '[' :
+		if val.startswith('[') :
 			# If a safe CURIE is asked for, a pure URI is not acceptable.
 			# Is checked below, and that is why the safe_curie flag is necessary
-			if val[-1] != ']' :
+			if not val.endswith(']') :
 				# that is certainly forbidden: an incomplete safe CURIE
 				self.options.add_warning(err_illegal_safe_CURIE % val, UnresolvablePrefix, node=self.node.nodeName)
 				return None
@@ -361,7 +494,7 @@ class ExecutionContext :
 				safe_curie = True
 		# There is a branch here depending on whether we are in 1.1 or 1.0 mode
 		if self.rdfa_version >= "1.1" :
-			retval = self.term_or_curie.CURIE_to_URI(val)
+			retval = self.term_or_curie.CURIE_to_URI(val, self)
 			if retval == None :
 				# the value could not be interpreted as a CURIE, ie, it did not produce any valid URI.
 				# The rule says that then the whole value should be considered as a URI
@@ -373,15 +506,15 @@ class ExecutionContext :
 					return self._URI(val)
 			else :
 				# there is an unlikely case where the retval is actually a URIRef with a relative URI. Better filter that one out
-				if isinstance(retval, BNode) == False and urlsplit(str(retval))[0] == "" :
+				if isinstance(retval, BNode) == False and _get_scheme(retval) == "" :
 					# yep, there is something wrong, a new URIRef has to be created:
-					return URIRef(self.base+str(retval))
+					return URIRef(self.base+retval)
 				else :
 					return retval
 		else :
 			# in 1.0 mode a CURIE can be considered only in case of a safe CURIE
 			if safe_curie :
-				return self.term_or_curie.CURIE_to_URI(val)
+				return self.term_or_curie.CURIE_to_URI(val, self)
 			else :
 				return self._URI(val)
 	# end _CURIEorURI
@@ -393,12 +526,10 @@ class ExecutionContext :
 		@type val: string
 		@return: an RDFLib URIRef instance or None
 		"""
-		from . import uri_schemes
 		# This case excludes the pure base, ie, the empty value
 		if val == "" :
 			return None
 		
-		from .termorcurie import ncname, termname
 		if termname.match(val) :
 			# This is a term, must be handled as such...			
 			retval = self.term_or_curie.term_to_URI(val)
@@ -409,12 +540,12 @@ class ExecutionContext :
 				return retval
 		else :
 			# try a CURIE
-			retval = self.term_or_curie.CURIE_to_URI(val)
+			retval = self.term_or_curie.CURIE_to_URI(val, self)
 			if retval :
 				return retval
 			elif self.rdfa_version >= "1.1" :
 				# See if it is an absolute URI
-				scheme = urlsplit(val)[0]
+				scheme = _get_scheme(val)
 				if scheme == "" :
 					# bug; there should be no relative URIs here
 					self.options.add_warning(err_non_legal_CURIE_ref % val, UnresolvablePrefix, node=self.node.nodeName)
@@ -422,7 +553,7 @@ class ExecutionContext :
 				else :
 					if scheme not in uri_schemes :
 						self.options.add_warning(err_URI_scheme % val.strip(), node=self.node.nodeName)
-					return URIRef(val)
+					return _intern_uriref(val)
 			else :
 				# rdfa 1.0 case
 				self.options.add_warning(err_undefined_CURIE % val.strip(), UnresolvablePrefix, node=self.node.nodeName)
@@ -434,33 +565,54 @@ class ExecutionContext :
 	def getURI(self, attr) :
 		"""Get the URI(s) for the attribute. The name of the attribute determines whether the value should be
 		a pure URI, a CURIE, etc, and whether the return is a single element of a list of those. This is done
-		using the L{ExecutionContext._resource_type} table.
+		using the L{ExecutionContext._resource_kind} table.
 		@param attr: attribute name
 		@type attr: string
 		@return: an RDFLib URIRef instance (or None) or a list of those
 		"""
-		if self.node.hasAttribute(attr) :
-			val = self.node.getAttribute(attr)
-		else :
-			if attr in ExecutionContext._list :
+		# getAttribute returns the empty string for a missing attribute, too; the (more expensive)
+		# hasAttribute call is necessary only to differentiate a genuinely empty value from a missing one
+		# (the class level tables are bound to locals: the method runs once per attribute per node)
+		is_list = attr in ExecutionContext._list
+		val = self.node.getAttribute(attr)
+		if val == "" and not self.node.hasAttribute(attr) :
+			if is_list :
 				return []
 			else :
 				return None
-		
-		# This may raise an exception if the attr has no key. This, actually,
-		# should not happen if the code is correct, but it does not harm having it here...
-		try :
-			func = ExecutionContext._resource_type[attr]
-		except :
-			# Actually, this should not happen...
+
+		# The attr should always have a key in the table if the code is correct, but a default does not harm...
+		kind = ExecutionContext._resource_kind.get(attr, ExecutionContext._URI_KIND)
+
+		# the interpreter methods all have fixed answers for an empty (or pure whitespace) value;
+		# those can be returned without going through the dispatch at all
+		val = val.strip()
+		if val == "" :
+			if is_list :
+				return []
+			elif kind == ExecutionContext._TERM_KIND :
+				return None
+			else :
+				return _intern_uriref(self.base)
+
+		if kind == ExecutionContext._URI_KIND :
 			func = ExecutionContext._URI
-		
-		if attr in ExecutionContext._list :
-			# Allows for a list
-			resources = [ func(self, v.strip()) for v in val.strip().split() if v != None ]
-			retval = [ r for r in resources if r != None ]
+		elif kind == ExecutionContext._CURIE_KIND :
+			func = ExecutionContext._CURIEorURI
 		else :
-			retval = func(self, val.strip())
+			func = ExecutionContext._TERMorCURIEorAbsURI
+
+		if is_list :
+			# Allows for a list; note that split() takes care of the whitespace around the tokens.
+			# A repeated token (e.g., rel="license license") is resolved only once
+			tokens = val.split()
+			unique = {}
+			for v in tokens :
+				if v not in unique :
+					unique[v] = func(self, v)
+			retval = [ unique[v] for v in tokens if unique[v] != None ]
+		else :
+			retval = func(self, val)
 		return retval
 	# end getURI
 	
@@ -547,6 +699,6 @@ class ExecutionContext :
 				self.list_mapping.mapping[property] = [ resource ]
 			else :
 				self.list_mapping.mapping[property] = None
-				
+
 
 ####################
@@ -69,20 +69,53 @@ from . import err_prefix_redefinition
 
 
 # Regular expression object for NCNAME
-ncname   = re.compile("^[A-Za-z][A-Za-z0-9._-]*$")
+ncname   = re.compile("^[A-Za-z][A-Za-z0-9._-]*\\Z")
 
 # Regular expression object for term name
-termname = re.compile("^[A-Za-z]([A-Za-z0-9._-]|/)*$")
+termname = re.compile("^[A-Za-z]([A-Za-z0-9._-]|/)*\\Z")
 
 # Regular expression object for a general XML application media type
 xml_application_media_type = re.compile("application/[a-zA-Z0-9]+\+xml")
 
+# The bound match methods are stored separately: the name and term checks run once per CURIE/term
+# in the document, and the local binding saves the module global plus attribute lookup per call
+_ncname_match   = ncname.match
+_termname_match = termname.match
+
+# A well formed @prefix attribute value is a whitespace separated list of "pref: URI" pairs;
+# this regular expression collects those pairs in a single sweep (see L{TermOrCurie.__init__})
+_prefix_decl = re.compile("(\\S+):\\s+(\\S+)")
+
 XHTML_PREFIX = "xhv"
 XHTML_URI    = "http://www.w3.org/1999/xhtml/vocab#"
 
-#### Managing blank nodes for CURIE-s: mapping from local names to blank nodes.
-_bnodes = {}
-_empty_bnode = BNode()
+#### Namespace instances, keyed by their URI. URIRef (and hence Namespace) construction goes
+# through rdflib's URI validation; the same declaration is typically repeated across elements
+# and documents, so identical URIs share one instance
+_namespace_cache = {}
+
+def _get_namespace(uri) :
+	"""Return a (shared) Namespace instance for the URI.
+	@param uri: namespace URI
+	@type uri: string
+	@return: Namespace instance
+	"""
+	ns = _namespace_cache.get(uri)
+	if ns is None :
+		ns = Namespace(uri)
+		_namespace_cache[uri] = ns
+	return ns
+
+# The hardwired RDFa 1.0 terms; built on first use and then shared by all the top level
+# TermOrCurie instances (the dictionary is never modified after construction)
+_predefined_1_0_terms = None
+
+# Term URIRef dictionaries of the initial contexts, keyed by the context id; the URIRef
+# construction is done only once per process instead of once per parsed document
+_initial_context_terms = {}
+
+# Sentinel for the per-instance CURIE cache ('None' is a valid, and cacheable, resolution result)
+_no_entry = object()
 
 ####
 
@@ -133,11 +166,28 @@ class InitialContext :
 			elif data.vocabulary != "" :
 				self.vocabulary = data.vocabulary
 
-			for key in data.terms :
-				self.terms[key] = URIRef(data.terms[key])
+			terms = _initial_context_terms.get(id)
+			if terms is None :
+				terms = {}
+				for key in data.terms :
+					terms[sys.intern(key)] = URIRef(data.terms[key])
+				_initial_context_terms[id] = terms
+			self.terms.update(terms)
 			for key in data.ns :
-				self.ns[key] = (Namespace(data.ns[key]),False)
+				self.ns[sys.intern(key)] = (_get_namespace(data.ns[key]),False)
+
 
+class _EmptyInitialContext :
+	"""Placeholder with the same (read-only) interface as an empty L{InitialContext}. Except for
+	the top level of an RDFa 1.1 document the initial context has no content at all, so the non
+	top level L{TermOrCurie} instances all share this single object instead of constructing a
+	new — invariably empty — L{InitialContext} (and its dictionaries) for every element.
+	"""
+	terms      = {}
+	ns         = {}
+	vocabulary = None
+
+_empty_initial_context = _EmptyInitialContext()
 
 ##################################################################################################################
 
@@ -162,15 +212,20 @@ class TermOrCurie :
 	@ivar ns: namespace declarations, ie, mapping from prefixes to URIs
 	@type ns: dictionary
 	@ivar default_curie_uri: URI for a default CURIE
+	@ivar bnodes: document level mapping from the local names of "_:xxx" CURIE-s to blank nodes
+	@type bnodes: dictionary
 	"""
-	def __init__(self, state, graph, inherited_state) :
-		"""Initialize the vocab bound to a specific state. 
+	def __init__(self, state, graph, inherited_state, attrs = None) :
+		"""Initialize the vocab bound to a specific state.
 		@param state: the state to which this vocab instance belongs to
 		@type state: L{state.ExecutionContext}
 		@param graph: the RDF graph being worked on
 		@type graph: rdflib.Graph
 		@param inherited_state: the state inherited by the current state. 'None' if this is the top level state.
 		@type inherited_state: L{state.ExecutionContext}
+		@param attrs: snapshot of the attributes of the node, mapping names to values; built here if
+		the caller (typically L{state.ExecutionContext}, which needs the same snapshot) does not provide it
+		@type attrs: dictionary
 		"""
 		def check_prefix(pr) :
 			from . import uri_schemes
@@ -180,18 +235,38 @@ class TermOrCurie :
 				
 		self.state	= state
 		self.graph	= graph
-		
+
+		if attrs is None :
+			attrs = dict(state.node.attributes.items()) if state.node.hasAttributes() else {}
+
+		# Per-instance memoization for the CURIE resolution; the same prefix:reference pair tends
+		# to show up on many elements of the same subtree (see CURIE_to_URI). The flag is raised
+		# by _check_reference to keep warning-producing resolutions out of the cache
+		self._curie_cache       = {}
+		self._resolution_warned = False
+
 		# --------------------------------------------------------------------------------
 		# This is set to non-void only on the top level and in the case of 1.1
-		default_vocab = InitialContext(self.state, inherited_state == None)
+		if inherited_state == None :
+			default_vocab = InitialContext(self.state, True)
+		else :
+			default_vocab = _empty_initial_context
 		
 		# Set the default CURIE URI
 		if inherited_state == None :
 			# This is the top level...
-			self.default_curie_uri = Namespace(XHTML_URI)
+			self.default_curie_uri = _get_namespace(XHTML_URI)
 			# self.graph.bind(XHTML_PREFIX, self.default_curie_uri)
+			# Blank nodes for the _:xxx CURIE-s are scoped to the document: the label mapping and
+			# the bnode used for the bare "_:" form are created here and inherited downwards.
+			# (These used to be module level, which made separate documents parsed by the same
+			# process share their blank nodes.)
+			self.bnodes      = {}
+			self.empty_bnode = BNode()
 		else :
 			self.default_curie_uri = inherited_state.term_or_curie.default_curie_uri
+			self.bnodes            = inherited_state.term_or_curie.bnodes
+			self.empty_bnode       = inherited_state.term_or_curie.empty_bnode
 		
 		# --------------------------------------------------------------------------------
 		# Set the default term URI
@@ -210,13 +285,19 @@ class TermOrCurie :
 			# see if there is local vocab that would override previous settings
 			# However, care should be taken with the vocab="" value that should not become a URI...
 			# Indeed, this value is used to 'vipe out', ie, get back to the default vocabulary...
-			if self.state.node.hasAttribute("vocab") and self.state.node.getAttribute("vocab") == "" :
-				self.default_term_uri = default_vocab.vocabulary
-			else :
-				def_term_uri = self.state.getURI("vocab")
-				if def_term_uri and def_term_uri != "" :			
-					self.default_term_uri = def_term_uri
-					self.graph.add((URIRef(self.state.base),RDFA_VOCAB,URIRef(def_term_uri)))
+			# (the attribute snapshot answers the presence question without a DOM probe; getURI,
+			# the only expensive step, is invoked only when the attribute is really there)
+			vocab_value = attrs.get("vocab")
+			if vocab_value != None :
+				if vocab_value == "" :
+					self.default_term_uri = default_vocab.vocabulary
+				else :
+					def_term_uri = self.state.getURI("vocab")
+					if def_term_uri and def_term_uri != "" :
+						self.default_term_uri = def_term_uri
+						# def_term_uri comes from getURI, ie, it is a URIRef already; no need to
+						# wrap (and thereby re-validate) it again
+						self.graph.add((URIRef(self.state.base),RDFA_VOCAB,def_term_uri))
 		else :
 			self.default_term_uri = None
 		
@@ -224,31 +305,34 @@ class TermOrCurie :
 		# The simpler case: terms, adding those that have been defined by a possible initial context
 		if inherited_state is None :
 			# this is the vocabulary belonging to the top level of the tree!
-			self.terms = {}
 			if state.rdfa_version >= "1.1" :
-				# Simply get the terms defined by the default vocabularies. There is no need for merging
-				for key in default_vocab.terms :
-					self.terms[key] = default_vocab.terms[key]
+				# Simply get the terms defined by the default vocabularies. There is no need for merging,
+				# and the dictionary is never modified afterwards, so it can be taken over by reference
+				self.terms = default_vocab.terms
 			else :
 				# The terms are hardwired...
-				for key in predefined_1_0_rel :
-					self.terms[key] = URIRef(XHTML_URI + key)
+				global _predefined_1_0_terms
+				if _predefined_1_0_terms is None :
+					_predefined_1_0_terms = {}
+					for key in predefined_1_0_rel :
+						_predefined_1_0_terms[sys.intern(key)] = URIRef(XHTML_URI + key)
+				self.terms = _predefined_1_0_terms
 		else :
 			# just refer to the inherited terms
 			self.terms = inherited_state.term_or_curie.terms
 
 		#-----------------------------------------------------------------
 		# the locally defined namespaces
-		dict = {}
+		ns_dict = {}
 		# locally defined xmlns namespaces, necessary for correct XML Literal generation
 		xmlns_dict = {}
 
-		# Add the locally defined namespaces using the xmlns: syntax
-		for i in range(0, state.node.attributes.length) :
-			attr = state.node.attributes.item(i)
-			if attr.name.find('xmlns:') == 0 :	
+		# Add the locally defined namespaces using the xmlns: syntax, using the attribute
+		# snapshot rather than a per-attribute walk of the minidom NamedNodeMap
+		for name, value in attrs.items() :
+			if name.startswith('xmlns:') :
 				# yep, there is a namespace setting
-				prefix = attr.localName
+				prefix = name[6:]
 				if prefix != "" : # exclude the top level xmlns setting...
 					if state.rdfa_version >= "1.1" and state.options.host_language in warn_xmlns_usage :
 						state.options.add_warning(err_xmlns_deprecated % prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
@@ -259,65 +343,79 @@ class TermOrCurie :
 					else :					
 						# quote the URI, ie, convert special characters into %.. This is
 						# true, for example, for spaces
-						uri = quote_URI(attr.value, state.options)
-						# create a new RDFLib Namespace entry
-						ns = Namespace(uri)
+						uri = quote_URI(value, state.options)
+						# get the (shared) RDFLib Namespace entry
+						ns = _get_namespace(uri)
 						# Add an entry to the dictionary if not already there (priority is left to right!)
+						# the prefix keys are interned: the dictionary lookups on the CURIE
+						# resolution path then mostly succeed on a pointer comparison
 						if state.rdfa_version >= "1.1" :
-							pr = prefix.lower()
+							pr = sys.intern(prefix.lower())
 						else :
-							pr = prefix
-						dict[pr]       = ns
+							pr = sys.intern(prefix)
+						ns_dict[pr]    = ns
 						xmlns_dict[pr] = ns
 						self.graph.bind(pr,ns)
 						check_prefix(pr)
 
 		# Add the locally defined namespaces using the @prefix syntax
 		# this may override the definition @xmlns
-		if state.rdfa_version >= "1.1" and state.node.hasAttribute("prefix") :
-			pr = state.node.getAttribute("prefix")
+		if state.rdfa_version >= "1.1" :
+			# the attribute snapshot replaces the DOM probe altogether
+			pr = attrs.get("prefix")
 			if pr != None :
-				# separator character is whitespace
-				pr_list = pr.strip().split()
-				# range(0, len(pr_list), 2) 
-				for i in range(len(pr_list) - 2, -1, -2) :
-					prefix = pr_list[i]
-					# see if there is a URI at all
-					if i == len(pr_list) - 1 :
-						state.options.add_warning(err_missing_URI_prefix % (prefix,pr), node=state.node.nodeName)
-						break
-					else :
-						value = pr_list[i+1]
-					
-					# see if the value of prefix is o.k., ie, there is a ':' at the end
-					if prefix[-1] != ':' :
-						state.options.add_warning(err_invalid_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
-						continue
-					elif prefix == ":" :
-						state.options.add_warning(err_no_default_prefix % pr, IncorrectPrefixDefinition, node=state.node.nodeName)
-						continue						
+				# The typical, well formed value is a whitespace separated list of "pref: URI" pairs,
+				# which the regular expression collects in a single sweep. If the sweep cannot account
+				# for all the tokens the value is malformed somewhere; the original token-by-token walk
+				# is then used instead, generating the corresponding warnings
+				pairs = _prefix_decl.findall(pr)
+				if 2 * len(pairs) != len(pr.split()) :
+					pairs = []
+					# separator character is whitespace
+					pr_list = pr.strip().split()
+					# range(0, len(pr_list), 2)
+					for i in range(len(pr_list) - 2, -1, -2) :
+						prefix = pr_list[i]
+						# see if there is a URI at all
+						if i == len(pr_list) - 1 :
+							state.options.add_warning(err_missing_URI_prefix % (prefix,pr), node=state.node.nodeName)
+							break
+						else :
+							value = pr_list[i+1]
+
+						# see if the value of prefix is o.k., ie, there is a ':' at the end
+						if prefix[-1] != ':' :
+							state.options.add_warning(err_invalid_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
+							continue
+						elif prefix == ":" :
+							state.options.add_warning(err_no_default_prefix % pr, IncorrectPrefixDefinition, node=state.node.nodeName)
+							continue
+						else :
+							pairs.insert(0, (prefix[:-1], value))
+
+				# the pairs are handled from right to left, so that the leftmost definition of a
+				# prefix is the one that ends up in the dictionary
+				for (prefix, value) in reversed(pairs) :
+					uri = _get_namespace(quote_URI(value, state.options))
+					if prefix == "" :
+						#something to be done here
+						self.default_curie_uri = uri
+					elif prefix == "_" :
+						state.options.add_warning(err_bnode_local_prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
 					else :
-						prefix = prefix[:-1]
-						uri    = Namespace(quote_URI(value, state.options))
-						if prefix == "" :
-							#something to be done here
-							self.default_curie_uri = uri
-						elif prefix == "_" :
-							state.options.add_warning(err_bnode_local_prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
+						# last check: is the prefix an NCNAME?
+						if _ncname_match(prefix) :
+							real_prefix = sys.intern(prefix.lower())
+							ns_dict[real_prefix] = uri
+							self.graph.bind(real_prefix,uri)
+							# Additional warning: is this prefix overriding an existing xmlns statement with a different URI? if
+							# so, that may lead to discrepancies between an RDFa 1.0 and RDFa 1.1 run...
+							if (prefix in xmlns_dict and xmlns_dict[prefix] != uri) or (real_prefix in xmlns_dict and xmlns_dict[real_prefix] != uri) :
+								state.options.add_warning(err_prefix_and_xmlns % (real_prefix,real_prefix), node=state.node.nodeName)
+							check_prefix(real_prefix)
+
 						else :
-							# last check: is the prefix an NCNAME?
-							if ncname.match(prefix) :
-								real_prefix = prefix.lower()
-								dict[real_prefix] = uri
-								self.graph.bind(real_prefix,uri)
-								# Additional warning: is this prefix overriding an existing xmlns statement with a different URI? if
-								# so, that may lead to discrepancies between an RDFa 1.0 and RDFa 1.1 run...
-								if (prefix in xmlns_dict and xmlns_dict[prefix] != uri) or (real_prefix in xmlns_dict and xmlns_dict[real_prefix] != uri) :
-									state.options.add_warning(err_prefix_and_xmlns % (real_prefix,real_prefix), node=state.node.nodeName)
-								check_prefix(real_prefix)
-
-							else :
-								state.options.add_warning(err_non_ncname_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
+							state.options.add_warning(err_non_ncname_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
 
 		# See if anything has been collected at all.
 		# If not, the namespaces of the incoming state is
@@ -330,32 +428,33 @@ class TermOrCurie :
 			self.default_prefixes = inherited_state.term_or_curie.default_prefixes
 			inherited_prefixes    = inherited_state.term_or_curie.ns
 
-		if len(dict) == 0 :
+		if len(ns_dict) == 0 :
 			self.ns = inherited_prefixes
 		else :
-			self.ns = {}
-			for key in inherited_prefixes : self.ns[key] = inherited_prefixes[key]
-			for key in dict : 
-				if (key in inherited_prefixes and dict[key] != inherited_prefixes[key]) or (key in self.default_prefixes and dict[key] != self.default_prefixes[key][0]) :
+			# copy() and update() do the merge in C; the Python level loop remains only for the
+			# redefinition warnings on the (typically few) locally declared prefixes
+			self.ns = inherited_prefixes.copy()
+			for key in ns_dict :
+				if (key in inherited_prefixes and ns_dict[key] != inherited_prefixes[key]) or (key in self.default_prefixes and ns_dict[key] != self.default_prefixes[key][0]) :
 					state.options.add_warning(err_prefix_redefinition % key, PrefixRedefinitionWarning, node=state.node.nodeName)
-				self.ns[key] = dict[key]
+				self.ns[key] = ns_dict[key]
 
-		
-		# the xmlns prefixes have to be stored separately, again for XML Literal generation	
-		self.xmlns = {}
+
+		# the xmlns prefixes have to be stored separately, again for XML Literal generation
 		if len(xmlns_dict) == 0 and inherited_state :
 			self.xmlns = inherited_state.term_or_curie.xmlns
+		elif inherited_state :
+			self.xmlns = inherited_state.term_or_curie.xmlns.copy()
+			self.xmlns.update(xmlns_dict)
 		else :
-			if inherited_state :
-				for key in inherited_state.term_or_curie.xmlns	: self.xmlns[key] = inherited_state.term_or_curie.xmlns[key]
-				for key in xmlns_dict							: self.xmlns[key] = xmlns_dict[key]
-			else :
-				self.xmlns = xmlns_dict
+			self.xmlns = xmlns_dict
 	# end __init__
 
-	def _check_reference(self, val) :
+	def _check_reference(self, val, state) :
 		"""Checking the CURIE reference for correctness. It is probably not 100% foolproof, but may take care
-		of some of the possible errors. See the URI RFC for the details.
+		of some of the possible errors. See the URI RFC for the details. A failed check raises a warning,
+		attributed to the node of the state the resolution is done for; such resolutions are also flagged
+		as non-cacheable, so that the warning is raised again for every occurrence.
 		"""
 		def char_check(s, not_allowed = ['#','[',']']) :
 			for c in not_allowed :
@@ -363,28 +462,57 @@ class TermOrCurie :
 			return True
 		# Creating an artificial http URI to fool the urlparse module...
 		scheme, netloc, url, query, fragment = urlsplit('http:' + val)
-		if netloc != "" and self.state.rdfa_version >= "1.1" :
-			self.state.options.add_warning(err_absolute_reference % (netloc, val), UnresolvableReference, node=self.state.node.nodeName)
+		if netloc != "" and state.rdfa_version >= "1.1" :
+			self._resolution_warned = True
+			state.options.add_warning(err_absolute_reference % (netloc, val), UnresolvableReference, node=state.node.nodeName)
 			return False
 		elif not char_check(query) :
-			self.state.options.add_warning(err_query_reference % (query, val), UnresolvableReference, node=self.state.node.nodeName)
+			self._resolution_warned = True
+			state.options.add_warning(err_query_reference % (query, val), UnresolvableReference, node=state.node.nodeName)
 			return False
 		elif not char_check(fragment) :
-			self.state.options.add_warning(err_fragment_reference % (fragment, val), UnresolvableReference, node=self.state.node.nodeName)
+			self._resolution_warned = True
+			state.options.add_warning(err_fragment_reference % (fragment, val), UnresolvableReference, node=state.node.nodeName)
 			return False
 		else :
 			return True
 
-	def CURIE_to_URI(self, val) :
-		"""CURIE to URI mapping. 
-		
+	def CURIE_to_URI(self, val, state = None) :
+		"""CURIE to URI mapping; cached front-end to L{_CURIE_to_URI}. The result of a resolution
+		is stored in a per-instance dictionary keyed by the full CURIE, because the same CURIE
+		typically appears on many elements sharing the same mappings. Resolutions that raised a
+		warning are I{not} cached: the warning must be issued — with the right node attribution —
+		for every occurrence.
+
+		@param val: the full CURIE
+		@type val: string
+		@param state: the state of the element the resolution is done for; warnings are attributed
+		to its node. Defaults to the state the instance was created with — the two differ when the
+		instance is shared with the descendants of its element.
+		@type state: L{state.ExecutionContext}
+		@return: URIRef of a URI or None.
+		"""
+		retval = self._curie_cache.get(val, _no_entry)
+		if retval is _no_entry :
+			if state is None : state = self.state
+			self._resolution_warned = False
+			retval = self._CURIE_to_URI(val, state)
+			if not self._resolution_warned :
+				self._curie_cache[val] = retval
+		return retval
+
+	def _CURIE_to_URI(self, val, state, _ncname_match = _ncname_match) :
+		"""CURIE to URI mapping.
+
 		This method does I{not} take care of the last step of CURIE processing, ie, the fact that if
 		it does not have a CURIE then the value is used a URI. This is done on the caller's side, because this has
 		to be combined with base, for example. The method I{does} take care of BNode processing, though, ie,
 		CURIE-s of the form "_:XXX".
-		
+
 		@param val: the full CURIE
 		@type val: string
+		@param state: the state of the element the resolution is done for
+		@type state: L{state.ExecutionContext}
 		@return: URIRef of a URI or None.
 		"""
 		# Just to be on the safe side:
@@ -402,10 +530,12 @@ class TermOrCurie :
 			# there is no ':' character in the string, ie, it is not a valid CURIE
 			return None
 		else :
-			if self.state.rdfa_version >= "1.1" :
-				prefix	= curie_split[0].lower()
+			# interned to match the (equally interned) keys of the prefix dictionaries; this runs
+			# only on a miss of the CURIE cache, so the intern table is not flooded either
+			if state.rdfa_version >= "1.1" :
+				prefix	= sys.intern(curie_split[0].lower())
 			else :
-				prefix	= curie_split[0]
+				prefix	= sys.intern(curie_split[0])
 			reference = curie_split[1]
 
 			#if len(reference) > 0 :
@@ -418,7 +548,7 @@ class TermOrCurie :
 			
 			# first possibility: empty prefix
 			if len(prefix) == 0 :
-				if self.default_curie_uri and self._check_reference(reference) :
+				if self.default_curie_uri and self._check_reference(reference, state) :
 					return self.default_curie_uri[reference]
 				else :
 					return None
@@ -427,29 +557,29 @@ class TermOrCurie :
 				if prefix == "_" :
 					# yep, BNode processing. There is a difference whether the reference is empty or not...
 					if len(reference) == 0 :
-						return _empty_bnode
+						return self.empty_bnode
 					else :
 						# see if this variable has been used before for a BNode
-						if reference in _bnodes :
-							return _bnodes[reference]
+						if reference in self.bnodes :
+							return self.bnodes[reference]
 						else :
 							# a new bnode...
 							retval = BNode()
-							_bnodes[reference] = retval
+							self.bnodes[reference] = retval
 							return retval
 				# check if the prefix is a valid NCNAME
-				elif ncname.match(prefix) :
+				elif _ncname_match(prefix) :
 					# see if there is a binding for this:					
-					if prefix in self.ns and self._check_reference(reference) :
+					if prefix in self.ns and self._check_reference(reference, state) :
 						# yep, a binding has been defined!
 						if len(reference) == 0 :
-							return URIRef(str(self.ns[prefix]))
+							return URIRef(self.ns[prefix])
 						else :
 							return self.ns[prefix][reference]
-					elif prefix in self.default_prefixes and self._check_reference(reference) :
+					elif prefix in self.default_prefixes and self._check_reference(reference, state) :
 						# this has been defined through the default context
 						if len(reference) == 0 :
-							return URIRef(str(self.default_prefixes[prefix][0]))
+							return URIRef(self.default_prefixes[prefix][0])
 						else :
 							(ns,used) = self.default_prefixes[prefix]
 							# lazy binding of prefixes (to avoid unnecessary prefix definitions in the serializations at the end...)
@@ -462,9 +592,9 @@ class TermOrCurie :
 						return None
 				else :
 					return None
-	# end CURIE_to_URI
+	# end _CURIE_to_URI
 
-	def term_to_URI(self, term) :
+	def term_to_URI(self, term, _termname_match = _termname_match) :
 		"""A term to URI mapping, where term is a simple string and the corresponding
 		URI is defined via the @vocab (ie, default term uri) mechanism. Returns None if term is not defined
 		@param term: string
@@ -472,7 +602,7 @@ class TermOrCurie :
 		"""
 		if len(term) == 0 : return None
 
-		if termname.match(term) :
+		if _termname_match(term) :
 			# It is a valid NCNAME
 			
 			# First of all, a @vocab nukes everything. That has to be done first...
@@ -480,20 +610,18 @@ class TermOrCurie :
 				return URIRef(self.default_term_uri + term)
 
 			# For default terms, the algorithm is (see 7.4.3 of the document): first make a case sensitive match;
-			# if that fails than make a case insensive one			
+			# if that fails than make a case insensive one
 			# 1. simple, case sensitive test:
-			if term in self.terms :
-				# yep, term is a valid key as is
+			uri = self.terms.get(term)
+			if uri == None :
+				# 2. case insensitive test; the term dictionaries (initial contexts as well as the
+				# hardwired 1.0 relations) are all keyed by the lower case names, so a single
+				# lookup replaces the former scan over all defined terms
+				uri = self.terms.get(term.lower())
+			if uri != None :
 				# lazy binding of the xhv prefix for terms...
 				self.graph.bind(XHTML_PREFIX, XHTML_URI)
-				return self.terms[term]
-				
-			# 2. case insensitive test
-			for defined_term in self.terms :
-				if term.lower() == defined_term.lower() :
-					# lazy binding of the xhv prefix for terms...
-					self.graph.bind(XHTML_PREFIX, XHTML_URI)
-					return self.terms[defined_term]
+				return uri
 
 		# If it got here, it is all wrong...
 		return None
@@ -24,14 +24,24 @@ Prototype = ns_rdfa["Pattern"]
 pref      = ns_rdfa["copy"]
 
 def handle_prototypes(graph) :
+	rdf_type  = ns_rdf["type"]
 	to_remove = set()
+	# the content of a prototype is collected only once, even when several resources refer to
+	# the same prototype, instead of re-scanning the store for each and every reference
+	pr_contents = {}
 	for (x,ref,PR) in graph.triples((None,pref,None)) :
-		if (PR,ns_rdf["type"],Prototype) in graph :
-			to_remove.add((PR,ns_rdf["type"],Prototype))
+		if (PR,rdf_type,Prototype) in graph :
+			to_remove.add((PR,rdf_type,Prototype))
 			to_remove.add((x,ref,PR))
 			# there is a reference to a prototype here
-			for (PR,p,y) in graph.triples((PR,None,None)) :
-				if not ( p == ns_rdf["type"] and y == Prototype ) :
-					graph.add((x,p,y))
-					to_remove.add((PR,p,y))
+			contents = pr_contents.get(PR)
+			if contents == None :
+				contents = []
+				for (PR,p,y) in graph.triples((PR,None,None)) :
+					if not ( p == rdf_type and y == Prototype ) :
+						contents.append((p,y))
+				pr_contents[PR] = contents
+			for (p,y) in contents :
+				graph.add((x,p,y))
+				to_remove.add((PR,p,y))
 	for t in to_remove : graph.remove(t)
\ No newline at end of file
@@ -192,7 +192,7 @@ def has_one_of_attributes(node,*args) :
 	else :
 		rargs = args
 	
-	return True in [ node.hasAttribute(attr) for attr in rargs ]
+	return any(node.hasAttribute(attr) for attr in rargs)
 
 #########################################################################################################
 def traverse_tree(node, func) :